@@ -7,10 +7,12 @@ from datetime import datetime
 import logging
 
 class LLMMetricsProcessor:
-    def __init__(self, archive_path, extract_dir, output_dir):
+    def __init__(self, archive_path, extract_dir, output_dir, catalog=None):
         self.archive_path = archive_path
         self.extract_dir = extract_dir
         self.output_dir = output_dir
+        # Optional RunCatalog; when set, run metadata comes from it instead of the filename
+        self.catalog = catalog
         
         logging.basicConfig(
             level=logging.INFO,
@@ -32,14 +34,22 @@ class LLMMetricsProcessor:
         records = []
         
         try:
-            # Parse filename components
             filename = os.path.basename(filepath)
-            parts = filename.replace('.jsonl', '').split('_')
+            run = self.catalog.lookup(filepath) if self.catalog is not None else None
             
-            server = parts[0]    # shortfin or sglang
-            date = parts[1]      # date component
-            rate = parts[2]      # request rate
-            model_type = parts[3] if len(parts) > 3 else 'default'  # none/trie for shortfin
+            if run is not None:
+                server = run['server']
+                date = run['timestamp'][:10]
+                rate = run['request_rate']
+                model_type = run['model_type']
+            else:
+                # Legacy files: parse filename components. The filename only carries the
+                # day of month, so take the full date from the file's modification time.
+                parts = filename.replace('.jsonl', '').split('_')
+                server = parts[0]    # shortfin or sglang
+                date = datetime.fromtimestamp(os.path.getmtime(filepath)).strftime('%Y-%m-%d')
+                rate = parts[2]      # request rate
+                model_type = parts[3] if len(parts) > 3 else 'default'  # none/trie for shortfin
             
             with open(filepath, 'r') as f:
                 for line in f:
@@ -47,7 +57,7 @@ class LLMMetricsProcessor:
                     record = {
                         # Metadata
                         'server': server,
-                        'date': datetime.strptime(date, '%d').strftime('%Y-%m-%d'),
+                        'date': date,
                         'request_rate': int(rate),
                         'model_type': model_type,
                         'dataset': data.get('dataset_name'),
@@ -77,6 +87,11 @@ class LLMMetricsProcessor:
             self.logger.error(f"Failed to process file {filepath}: {str(e)}")
             return None
 
+    def add_derived_metrics(self, df):
+        # Add some useful derived metrics
+        df['tokens_per_second'] = df['output_tokens'] / df['duration']
+        return df
+
     def process_all_files(self):
         all_data = []
         
@@ -98,10 +113,7 @@ class LLMMetricsProcessor:
             combined_df = pd.concat(all_data, ignore_index=True)
             self.logger.info(f"Successfully combined data from {len(all_data)} files")
             
-            # Add some useful derived metrics
-            combined_df['tokens_per_second'] = combined_df['output_tokens'] / combined_df['duration']
-            
-            return combined_df
+            return self.add_derived_metrics(combined_df)
         else:
             raise ValueError("No data was successfully processed")
 
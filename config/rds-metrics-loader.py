@@ -70,15 +70,30 @@ class RDSMetricsLoader:
             self.logger.error(f"Failed to initialize database: {str(e)}")
             raise
 
-    def load_metrics(self, csv_path):
-        """Load metrics from CSV into RDS"""
+    def upsert_metrics(self, df):
+        """Replace the rows for each (server, date, request_rate, model_type) in df"""
+        keys = df[['server', 'date', 'request_rate', 'model_type']].drop_duplicates()
+        with self.engine.begin() as conn:
+            for key in keys.to_dict('records'):
+                conn.execute(text("""
+                    DELETE FROM llm_metrics
+                    WHERE server = :server AND date = :date
+                      AND request_rate = :request_rate AND model_type = :model_type
+                """), key)
+            df.to_sql('llm_metrics', conn, if_exists='append', index=False)
+
+    def load_metrics(self, csv_path, replace=False):
+        """Load metrics from CSV into RDS, replacing rows for the same runs if `replace`"""
         try:
             # Read CSV file
             df = pd.read_csv(csv_path)
             self.logger.info(f"Loading {len(df)} records from {csv_path}")
             
             # Load data into database
-            df.to_sql('llm_metrics', self.engine, if_exists='append', index=False)
+            if replace:
+                self.upsert_metrics(df)
+            else:
+                df.to_sql('llm_metrics', self.engine, if_exists='append', index=False)
             
             # Verify the load
             with self.engine.connect() as conn:
@@ -1,20 +1,21 @@
 import subprocess
 import os
 import logging
-import schedule
 import time
+import threading
 from datetime import datetime
-import mysql.connector
-from sqlalchemy import create_engine
-import pandas as pd
 import sys
 
+from run_catalog import RunCatalog
+from script_loader import load_script
+
 class LLMMetricsPipeline:
     def __init__(self, rds_host, rds_user, rds_password, rds_database):
         self.setup_logging()
         self.setup_database_connection(rds_host, rds_user, rds_password, rds_database)
         self.benchmark_dir = "./benchmark_files"
         self.processed_dir = "./processed_data"
+        self._catalog = None
 
     def setup_logging(self):
         logging.basicConfig(
@@ -34,9 +35,38 @@ class LLMMetricsPipeline:
             'password': password,
             'database': database
         }
-        self.engine = create_engine(
-            f"mysql+mysqlconnector://{user}:{password}@{host}/{database}"
-        )
+        self._engine = None
+
+    @property
+    def engine(self):
+        # Created on first use so collection and processing don't pay for sqlalchemy
+        if self._engine is None:
+            from sqlalchemy import create_engine
+            cfg = self.db_config
+            self._engine = create_engine(
+                f"mysql+mysqlconnector://{cfg['user']}:{cfg['password']}@{cfg['host']}/{cfg['database']}"
+            )
+        return self._engine
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            self._catalog = RunCatalog(os.path.join(self.benchmark_dir, 'run_catalog.sqlite'))
+        return self._catalog
+
+    def record_runs(self, started, server, request_rate, model_type='default'):
+        """Catalog the output files written by a benchmark started at `started`"""
+        # Catalog failures are logged and never abort the benchmark sweep
+        try:
+            for entry in os.scandir(self.benchmark_dir):
+                if entry.name.endswith('.jsonl') and entry.stat().st_mtime >= started:
+                    try:
+                        self.catalog.record(server, request_rate, model_type, entry.path)
+                        self.logger.info(f"Catalogued {entry.name}")
+                    except Exception as e:
+                        self.logger.error(f"Error cataloguing {entry.name}: {str(e)}")
+        except Exception as e:
+            self.logger.error(f"Error cataloguing runs in {self.benchmark_dir}: {str(e)}")
 
     def run_benchmark(self):
         """Run the benchmark collection"""
@@ -49,13 +79,17 @@ class LLMMetricsPipeline:
             # Run benchmark command for each configuration
             for request_rate in [1, 2, 4, 8, 16, 32]:
                 # SGLang benchmarks
+                started = time.time()
                 cmd = f"python benchmark-collector.py --server sglang --rate {request_rate}"
                 subprocess.run(cmd, shell=True, check=True)
+                self.record_runs(started, 'sglang', request_rate)
                 
                 # Shortfin benchmarks (none and trie)
                 for model_type in ['none', 'trie']:
+                    started = time.time()
                     cmd = f"python benchmark-collector.py --server shortfin --rate {request_rate} --model {model_type}"
                     subprocess.run(cmd, shell=True, check=True)
+                    self.record_runs(started, 'shortfin', request_rate, model_type)
             
             self.logger.info("Benchmark collection completed")
             return True
@@ -72,9 +106,14 @@ class LLMMetricsPipeline:
             # Create output directory
             os.makedirs(self.processed_dir, exist_ok=True)
             
-            # Process metrics using existing processor
-            cmd = f"python metrics-processor.py"
-            subprocess.run(cmd, shell=True, check=True)
+            # Process metrics in-process instead of spawning a new interpreter
+            processor = load_script('metrics_processor').LLMMetricsProcessor(
+                archive_path="benchmark_files.7z",
+                extract_dir="./extracted_files",
+                output_dir=self.processed_dir,
+                catalog=self.catalog
+            )
+            processor.run(output_format='csv')
             
             return True
             
@@ -96,6 +135,7 @@ class LLMMetricsPipeline:
             csv_path = os.path.join(self.processed_dir, latest_csv)
             
             # Load data
+            import pandas as pd
             df = pd.read_csv(csv_path)
             df.to_sql('llm_metrics', self.engine, if_exists='append', index=False)
             
@@ -127,6 +167,184 @@ class LLMMetricsPipeline:
             self.logger.error(f"Pipeline failed: {str(e)}")
             raise
 
+    def benchmark_file_states(self):
+        """Return {path: (mtime, size)} for every benchmark output file"""
+        states = {}
+        for entry in os.scandir(self.benchmark_dir):
+            if entry.name.endswith('.jsonl'):
+                stat = entry.stat()
+                states[entry.path] = (stat.st_mtime, stat.st_size)
+        return states
+
+    def prepare_streaming(self):
+        """Create the metrics table and the file processor before any file is watched
+        
+        The processor's catalog connection may be used from the watcher thread; the
+        caller closes it with `processor.catalog.close()` once watching is done.
+        """
+        loader = load_script('rds_metrics_loader').RDSMetricsLoader(
+            self.db_config['host'], self.db_config['user'],
+            self.db_config['password'], self.db_config['database']
+        )
+        loader.initialize_database()
+        
+        catalog = RunCatalog(os.path.join(self.benchmark_dir, 'run_catalog.sqlite'),
+                             check_same_thread=False)
+        processor = load_script('metrics_processor').LLMMetricsProcessor(
+            archive_path=None,
+            extract_dir=self.benchmark_dir,
+            output_dir=self.processed_dir,
+            catalog=catalog
+        )
+        return loader, processor
+
+    def ingest_files(self, paths, loader, processor, notify=None):
+        """Parse finished benchmark files and upsert them as one batch"""
+        frames = []
+        for path in paths:
+            df = processor.process_jsonl_file(path)
+            if df is None:
+                raise ValueError(f"Could not parse {path}")
+            if not df.empty:
+                frames.append(df)
+        if not frames:
+            return 0
+            
+        import pandas as pd
+        df = processor.add_derived_metrics(pd.concat(frames, ignore_index=True))
+        loader.upsert_metrics(df)
+        self.logger.info(f"Streamed {len(df)} records from {len(frames)} files")
+        
+        if notify is not None:
+            try:
+                notify(df)
+            except Exception as e:
+                self.logger.error(f"Error notifying dashboard: {str(e)}")
+        return len(df)
+
+    def ingest_batch(self, batch, loader, processor, notify=None):
+        """Ingest a batch, retrying file by file if it fails; return {path: error}"""
+        try:
+            self.ingest_files(batch, loader, processor, notify)
+            return {}
+        except Exception as e:
+            if len(batch) == 1:
+                return {batch[0]: e}
+            self.logger.error(f"Error streaming {len(batch)} files, retrying one at a time: {str(e)}")
+        
+        errors = {}
+        for path in batch:
+            try:
+                self.ingest_files([path], loader, processor, notify)
+            except Exception as e:
+                errors[path] = e
+        return errors
+
+    def watch_benchmark_dir(self, stop_event, loader, processor, seen=None, poll_interval=2.0,
+                            batch_size=6, notify=None, max_attempts=10, max_backoff=300.0,
+                            failed=None):
+        """Ingest benchmark files as soon as they are complete, until stop_event is set
+        
+        A file counts as complete once its size and mtime are unchanged between two
+        polls. Once stop_event is set every remaining file is ingested, then the
+        watcher returns. Files in `seen` with an unchanged state are skipped.
+        
+        A file that fails is retried with exponential backoff, starting at
+        `poll_interval` and capped at `max_backoff` seconds. After `max_attempts`
+        failures it is abandoned and appended to `failed`, which is returned.
+        """
+        seen = dict(seen or {})
+        pending = {}
+        attempts = {}
+        retry_at = {}
+        failed = [] if failed is None else failed
+        
+        while True:
+            stopping = stop_event.is_set()
+            now = time.monotonic()
+            ready = {}
+            for path, state in self.benchmark_file_states().items():
+                if seen.get(path) == state:
+                    continue
+                if retry_at.get(path, 0) > now:
+                    continue
+                if stopping or pending.get(path) == state:
+                    ready[path] = state
+                pending[path] = state
+            
+            paths = sorted(ready)
+            for i in range(0, len(paths), batch_size):
+                batch = paths[i:i + batch_size]
+                errors = self.ingest_batch(batch, loader, processor, notify)
+                for path in batch:
+                    if path not in errors:
+                        seen[path] = ready[path]
+                        attempts.pop(path, None)
+                        retry_at.pop(path, None)
+                        continue
+                    
+                    attempts[path] = attempts.get(path, 0) + 1
+                    if attempts[path] < max_attempts:
+                        delay = min(poll_interval * 2 ** (attempts[path] - 1), max_backoff)
+                        retry_at[path] = time.monotonic() + delay
+                        self.logger.error(f"Error streaming {path} (attempt {attempts[path]}), "
+                                          f"retrying in {delay:.0f}s: {str(errors[path])}")
+                        continue
+                    self.logger.error(f"Giving up on {path} after {max_attempts} attempts: {str(errors[path])}")
+                    # A later rewrite of the file changes its state and starts a fresh budget
+                    seen[path] = ready[path]
+                    attempts.pop(path, None)
+                    retry_at.pop(path, None)
+                    failed.append(path)
+            
+            if stopping and not retry_at:
+                return failed
+            if stopping:
+                # stop_event.wait would return immediately; sleep until the next retry is due
+                time.sleep(max(min(retry_at.values()) - time.monotonic(), 0))
+            else:
+                stop_event.wait(poll_interval)
+
+    def run_streaming_pipeline(self, poll_interval=2.0, batch_size=6, notify=None,
+                               max_attempts=10, include_existing=False):
+        """Run the benchmark sweep, loading each cell's results as soon as it finishes"""
+        self.logger.info("Starting streaming pipeline run")
+        os.makedirs(self.benchmark_dir, exist_ok=True)
+        
+        # Fail before the sweep starts if the database or processor isn't usable
+        loader, processor = self.prepare_streaming()
+        
+        # Results left over from earlier sweeps are skipped unless include_existing
+        seen = {} if include_existing else self.benchmark_file_states()
+        stop_event = threading.Event()
+        outcome = {}
+        
+        def watch():
+            try:
+                outcome['failed'] = self.watch_benchmark_dir(
+                    stop_event, loader, processor, seen, poll_interval=poll_interval,
+                    batch_size=batch_size, notify=notify, max_attempts=max_attempts
+                )
+            except Exception as e:
+                self.logger.error(f"Streaming watcher failed: {str(e)}")
+                outcome['error'] = e
+        
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        try:
+            if not self.run_benchmark():
+                raise Exception("Benchmark collection failed")
+        finally:
+            stop_event.set()
+            watcher.join()
+            processor.catalog.close()
+        
+        if 'error' in outcome:
+            raise Exception(f"Streaming watcher failed: {str(outcome['error'])}")
+        if outcome['failed']:
+            raise Exception(f"Failed to stream {len(outcome['failed'])} files: {', '.join(outcome['failed'])}")
+        self.logger.info("Streaming pipeline completed successfully")
+
 def run_scheduled_pipeline(pipeline):
     """Wrapper function for scheduled execution"""
     try:
@@ -135,6 +353,8 @@ def run_scheduled_pipeline(pipeline):
         logging.error(f"Scheduled pipeline run failed: {str(e)}")
 
 if __name__ == "__main__":
+    import schedule
+
     # Database configuration
     DB_HOST = "llm-metrics.c3kwuosg6kjs.us-east-2.rds.amazonaws.com"
     DB_USER = "admin"
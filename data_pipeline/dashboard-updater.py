@@ -1,10 +1,11 @@
 import json
-import glob
 import pandas as pd
 import requests
 from datetime import datetime
 import os
 
+from run_catalog import RunCatalog
+
 class GrafanaDashboardUpdater:
     def __init__(self, api_key, grafana_url):
         self.api_key = api_key
@@ -32,32 +33,35 @@ class GrafanaDashboardUpdater:
         
         return metrics
         
-    def collect_metrics(self, data_dir):
-        """Collect metrics from all JSONL files."""
+    def collect_metrics(self, data_dir, catalog=None):
+        """Collect metrics from the latest catalogued run of each configuration."""
         metrics_data = []
+        if catalog is None:
+            catalog = RunCatalog.open_existing(os.path.join(data_dir, 'run_catalog.sqlite'))
+        if catalog is None or catalog.count() == 0:
+            # No catalog for this directory: index its files into a throwaway in-memory one
+            catalog = RunCatalog(':memory:')
+            catalog.index_directory(data_dir)
+        if catalog.count() == 0:
+            raise ValueError(f"No benchmark runs found in {data_dir}")
         
-        # Process all files
-        for pattern in ['shortfin_10_*_none.jsonl', 'shortfin_10_*_trie.jsonl', 'sglang_10_*.jsonl']:
-            files = glob.glob(os.path.join(data_dir, pattern))
-            for file in files:
-                # Extract concurrent requests from filename
-                concurrent = int(file.split('_')[2])
-                # Determine system and cache type
-                if 'shortfin' in file:
-                    system = 'Shortfin'
-                    cache_type = 'Trie' if 'trie' in file else 'Base'
-                else:
-                    system = 'SGLang'
-                    cache_type = 'N/A'
-                    
-                metrics = self.process_jsonl_file(file)
-                metrics_data.append({
-                    'system': system,
-                    'cache_type': cache_type,
-                    'concurrent_requests': concurrent,
-                    **metrics,
-                    'timestamp': datetime.now().isoformat()
-                })
+        for run in catalog.latest():
+            # Determine system and cache type
+            if run['server'] == 'shortfin':
+                system = 'Shortfin'
+                cache_type = 'Trie' if run['model_type'] == 'trie' else 'Base'
+            else:
+                system = 'SGLang'
+                cache_type = 'N/A'
+                
+            metrics = self.process_jsonl_file(run['file_path'])
+            metrics_data.append({
+                'system': system,
+                'cache_type': cache_type,
+                'concurrent_requests': run['request_rate'],
+                **metrics,
+                'timestamp': run['timestamp']
+            })
         
         return metrics_data
 
@@ -157,6 +161,26 @@ class GrafanaDashboardUpdater:
         
         return response.json()
 
+    def annotate(self, text, tags=None):
+        """Post a dashboard annotation, e.g. to mark newly streamed results."""
+        annotation = {
+            "dashboardUID": "cluster-metrics",
+            "time": int(datetime.now().timestamp() * 1000),
+            "tags": tags or [],
+            "text": text
+        }
+        
+        response = requests.post(
+            f"{self.grafana_url}/api/annotations",
+            headers=self.headers,
+            json=annotation
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Failed to post annotation: {response.text}")
+        
+        return response.json()
+
 def main():
     # Configuration
     API_KEY = os.getenv('GRAFANA_API_KEY')
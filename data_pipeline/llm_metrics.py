@@ -0,0 +1,262 @@
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import threading
+
+from run_catalog import RunCatalog
+from script_loader import load_script, load_times, loaded_heavy_modules
+
+# Heavy dependencies (pandas, sqlalchemy, mysql.connector, py7zr, requests) are
+# only pulled in by the scripts each subcommand loads, never at module import.
+
+
+def db_args(parser):
+    parser.add_argument('--host', default=os.getenv('RDS_HOST', 'localhost'))
+    parser.add_argument('--user', default=os.getenv('RDS_USER', 'admin'))
+    parser.add_argument('--password', default=os.getenv('RDS_PASSWORD', ''))
+    parser.add_argument('--database', default=os.getenv('RDS_DATABASE', 'llm_metrics'))
+
+
+def latest_csv(processed_dir):
+    csv_files = glob.glob(os.path.join(processed_dir, '*.csv'))
+    if not csv_files:
+        raise FileNotFoundError(f"No processed CSV files found in {processed_dir}")
+    return max(csv_files, key=os.path.getctime)
+
+
+def cmd_collect(args):
+    pipeline_cls = load_script('collection_pipeline').LLMMetricsPipeline
+    pipeline = pipeline_cls(args.host, args.user, args.password, args.database)
+    pipeline.benchmark_dir = args.benchmark_dir
+    if not pipeline.run_benchmark():
+        return 1
+    return 0
+
+
+def cmd_stream(args):
+    pipeline_cls = load_script('collection_pipeline').LLMMetricsPipeline
+    pipeline = pipeline_cls(args.host, args.user, args.password, args.database)
+    pipeline.benchmark_dir = args.benchmark_dir
+
+    notify = None
+    if args.api_key and args.grafana_url:
+        updater = load_script('dashboard_updater').GrafanaDashboardUpdater(
+            args.api_key, args.grafana_url
+        )
+
+        def notify(df):
+            runs = df[['server', 'model_type', 'request_rate']].drop_duplicates()
+            cells = ', '.join(f"{r.server}/{r.model_type}@{r.request_rate}" for r in runs.itertuples())
+            updater.annotate(f"Streamed {len(df)} records: {cells}", tags=['llm-metrics', 'streaming'])
+
+    if not args.watch_only:
+        pipeline.run_streaming_pipeline(args.poll_interval, args.batch_size, notify,
+                                        args.max_attempts, args.include_existing)
+        return 0
+
+    # Watch a directory fed by an external collector until interrupted
+    os.makedirs(args.benchmark_dir, exist_ok=True)
+    loader, processor = pipeline.prepare_streaming()
+    seen = {} if args.include_existing else pipeline.benchmark_file_states()
+    stop_event = threading.Event()
+    failed = []
+    try:
+        pipeline.watch_benchmark_dir(stop_event, loader, processor, seen, args.poll_interval,
+                                     args.batch_size, notify, args.max_attempts, failed=failed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processor.catalog.close()
+    if failed:
+        logging.error(f"Failed to stream {len(failed)} files: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def cmd_process(args):
+    processor = load_script('metrics_processor').LLMMetricsProcessor(
+        archive_path=args.archive,
+        extract_dir=args.extract_dir,
+        output_dir=args.processed_dir,
+        catalog=RunCatalog.open_existing(args.catalog)
+    )
+    processor.run(output_format=args.format)
+    return 0
+
+
+def cmd_load(args):
+    csv_path = args.csv or latest_csv(args.processed_dir)
+    loader = load_script('rds_metrics_loader').RDSMetricsLoader(
+        args.host, args.user, args.password, args.database
+    )
+    loader.initialize_database()
+    loader.load_metrics(csv_path)
+    return 0
+
+
+def cmd_dashboard(args):
+    if not all([args.api_key, args.grafana_url]):
+        raise ValueError("Missing Grafana API key or URL")
+
+    updater = load_script('dashboard_updater').GrafanaDashboardUpdater(
+        args.api_key, args.grafana_url
+    )
+    catalog = RunCatalog.open_existing(args.catalog)
+    if args.catalog and catalog is None:
+        raise FileNotFoundError(f"Run catalog not found: {args.catalog}")
+    metrics_data = updater.collect_metrics(args.data_dir, catalog=catalog)
+    result = updater.update_dashboard(metrics_data)
+    print(f"Dashboard updated successfully: {result}")
+    return 0
+
+
+def cmd_backfill(args):
+    csv_files = args.csv or sorted(
+        glob.glob(os.path.join(args.processed_dir, '*.csv')), key=os.path.getctime
+    )
+    if not csv_files:
+        raise FileNotFoundError(f"No processed CSV files found in {args.processed_dir}")
+
+    loader = load_script('rds_metrics_loader').RDSMetricsLoader(
+        args.host, args.user, args.password, args.database
+    )
+    loader.initialize_database()
+    for csv_path in csv_files:
+        # Most CSVs were already loaded nightly; replace their rows instead of duplicating
+        loader.load_metrics(csv_path, replace=True)
+    return 0
+
+
+def cmd_index(args):
+    catalog = RunCatalog(args.catalog or os.path.join(args.benchmark_dir, 'run_catalog.sqlite'))
+    indexed = catalog.index_directory(args.benchmark_dir)
+    print(f"Catalogued {indexed} benchmark files ({catalog.count()} runs total)")
+    return 0
+
+
+def cmd_status(args):
+    """Report pipeline state from the filesystem only; no heavy imports"""
+    benchmark_files = glob.glob(os.path.join(args.benchmark_dir, '*.jsonl'))
+    print(f"Benchmark files in {args.benchmark_dir}: {len(benchmark_files)}")
+
+    catalog = RunCatalog.open_existing(os.path.join(args.benchmark_dir, 'run_catalog.sqlite'))
+    if catalog is not None:
+        print(f"Catalogued runs: {catalog.count()}")
+
+    csv_files = glob.glob(os.path.join(args.processed_dir, '*.csv'))
+    if csv_files:
+        print(f"Latest processed file: {latest_csv(args.processed_dir)} ({len(csv_files)} total)")
+    else:
+        print(f"No processed files in {args.processed_dir}")
+
+    if os.path.exists(args.log_file):
+        with open(args.log_file, 'r') as f:
+            lines = f.readlines()[-args.lines:]
+        print(f"Last {len(lines)} lines of {args.log_file}:")
+        print(''.join(lines), end='')
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='llm_metrics',
+        description='Collect, process and load Shortfin/SGLang benchmark metrics'
+    )
+    parser.add_argument('--timing', action='store_true',
+                        help='Print startup and script import times to stderr')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', help='Run the benchmark sweep')
+    collect.add_argument('--benchmark-dir', default='./benchmark_files')
+    db_args(collect)
+    collect.set_defaults(func=cmd_collect)
+
+    stream = subparsers.add_parser('stream', help='Load results into the database as each cell finishes')
+    stream.add_argument('--benchmark-dir', default='./benchmark_files')
+    stream.add_argument('--poll-interval', type=float, default=2.0)
+    stream.add_argument('--batch-size', type=int, default=6)
+    stream.add_argument('--max-attempts', type=int, default=10,
+                        help='Failures, with exponential backoff, before a file is abandoned')
+    stream.add_argument('--include-existing', action='store_true',
+                        help='Also ingest files already in --benchmark-dir, e.g. to reload abandoned ones')
+    stream.add_argument('--watch-only', action='store_true',
+                        help='Only watch --benchmark-dir; do not run the benchmark sweep')
+    stream.add_argument('--api-key', default=os.getenv('GRAFANA_API_KEY'))
+    stream.add_argument('--grafana-url', default=os.getenv('GRAFANA_URL'))
+    db_args(stream)
+    stream.set_defaults(func=cmd_stream)
+
+    process = subparsers.add_parser('process', help='Extract and process a benchmark archive')
+    process.add_argument('--archive', default='benchmark_files.7z')
+    process.add_argument('--extract-dir', default='./extracted_files')
+    process.add_argument('--processed-dir', default='./processed_data')
+    process.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    process.add_argument('--catalog', default='./benchmark_files/run_catalog.sqlite',
+                         help='Run catalog supplying file metadata, if present')
+    process.set_defaults(func=cmd_process)
+
+    load = subparsers.add_parser('load', help='Load a processed CSV into the metrics database')
+    load.add_argument('--csv', help='CSV to load (default: latest in --processed-dir)')
+    load.add_argument('--processed-dir', default='./processed_data')
+    db_args(load)
+    load.set_defaults(func=cmd_load)
+
+    dashboard = subparsers.add_parser('dashboard', help='Update the Grafana dashboard')
+    dashboard.add_argument('--api-key', default=os.getenv('GRAFANA_API_KEY'))
+    dashboard.add_argument('--grafana-url', default=os.getenv('GRAFANA_URL'))
+    dashboard.add_argument('--data-dir', default=os.getenv('DATA_DIR', '/data/metrics'))
+    dashboard.add_argument('--catalog', help='Run catalog (default: run_catalog.sqlite in --data-dir)')
+    dashboard.set_defaults(func=cmd_dashboard)
+
+    backfill = subparsers.add_parser('backfill', help='Reload processed CSVs oldest first, replacing rows for the same runs')
+    backfill.add_argument('csv', nargs='*', help='CSVs to load (default: all in --processed-dir)')
+    backfill.add_argument('--processed-dir', default='./processed_data')
+    db_args(backfill)
+    backfill.set_defaults(func=cmd_backfill)
+
+    index = subparsers.add_parser('index', help='Catalog existing benchmark files')
+    index.add_argument('--benchmark-dir', default='./benchmark_files')
+    index.add_argument('--catalog', help='Run catalog (default: run_catalog.sqlite in --benchmark-dir)')
+    index.set_defaults(func=cmd_index)
+
+    status = subparsers.add_parser('status', help='Show pipeline files and recent log output')
+    status.add_argument('--benchmark-dir', default='./benchmark_files')
+    status.add_argument('--processed-dir', default='./processed_data')
+    status.add_argument('--log-file', default='llm_pipeline.log')
+    status.add_argument('--lines', type=int, default=10)
+    status.set_defaults(func=cmd_status)
+
+    return parser
+
+
+def report_timing(command, startup, total):
+    print(f"[timing] {command}: startup {startup * 1000:.1f} ms, total {total * 1000:.1f} ms",
+          file=sys.stderr)
+    for name, elapsed in load_times.items():
+        print(f"[timing]   load {name}: {elapsed * 1000:.1f} ms", file=sys.stderr)
+    heavy = loaded_heavy_modules()
+    print(f"[timing]   heavy modules imported: {', '.join(heavy) or 'none'}", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    startup = time.perf_counter() - _START
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        logging.error(f"{args.command} failed: {str(e)}")
+        return 1
+    finally:
+        if args.timing:
+            report_timing(args.command, startup, time.perf_counter() - _START)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+
+class RunCatalog:
+    """SQLite-indexed manifest of benchmark runs, one row per output file"""
+
+    COLUMNS = ('timestamp', 'server', 'request_rate', 'model_type', 'dataset',
+               'file_name', 'file_path', 'file_size')
+    FILTERS = ('server', 'request_rate', 'model_type', 'dataset', 'file_name', 'file_path', 'file_size')
+
+    def __init__(self, db_path, readonly=False, check_same_thread=True):
+        self.db_path = db_path
+        if readonly:
+            uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+        else:
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+        self.conn.row_factory = sqlite3.Row
+        if not readonly:
+            self.create_tables()
+
+    @classmethod
+    def open_existing(cls, db_path):
+        """Open a catalog read-only, or return None if it doesn't exist"""
+        if not db_path or not os.path.isfile(db_path):
+            return None
+        return cls(db_path, readonly=True)
+
+    def create_tables(self):
+        """Create the runs table and the indexes used for lookups"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                server TEXT NOT NULL,
+                request_rate INTEGER NOT NULL,
+                model_type TEXT NOT NULL,
+                dataset TEXT,
+                file_name TEXT NOT NULL,
+                file_path TEXT NOT NULL UNIQUE,
+                file_size INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_runs_server ON runs (server, model_type, request_rate, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_runs_request_rate ON runs (request_rate);
+            CREATE INDEX IF NOT EXISTS idx_runs_model ON runs (model_type);
+            CREATE INDEX IF NOT EXISTS idx_runs_dataset ON runs (dataset);
+            CREATE INDEX IF NOT EXISTS idx_runs_file_name ON runs (file_name);
+            CREATE INDEX IF NOT EXISTS idx_runs_file_size ON runs (file_size);
+        """)
+        self.conn.commit()
+
+    def record(self, server, request_rate, model_type, file_path, dataset=None, timestamp=None):
+        """Add or update the catalog entry for one finished benchmark file"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        if timestamp is None:
+            timestamp = datetime.fromtimestamp(stat.st_mtime)
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat(timespec='seconds')
+        if dataset is None:
+            dataset = self.read_dataset(file_path)
+
+        self.conn.execute("""
+            INSERT INTO runs (timestamp, server, request_rate, model_type, dataset,
+                              file_name, file_path, file_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (file_path) DO UPDATE SET
+                timestamp = excluded.timestamp,
+                server = excluded.server,
+                request_rate = excluded.request_rate,
+                model_type = excluded.model_type,
+                dataset = excluded.dataset,
+                file_size = excluded.file_size
+        """, (timestamp, server, int(request_rate), model_type or 'default', dataset,
+              os.path.basename(file_path), file_path, stat.st_size))
+        self.conn.commit()
+
+    @staticmethod
+    def read_dataset(file_path):
+        """Return the dataset name from the first result line, or None if unreadable"""
+        try:
+            with open(file_path, 'r') as f:
+                line = f.readline()
+            if not line.strip():
+                return None
+            return json.loads(line).get('dataset_name')
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read dataset from {file_path}: {str(e)}")
+            return None
+
+    def find(self, since=None, until=None, **filters):
+        """Return runs matching the given dimensions, oldest first"""
+        clauses, params = self._where(filters)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT * FROM runs {where} ORDER BY timestamp", params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def lookup(self, file_path):
+        """Return the run recorded for a file, or None if unknown or ambiguous
+        
+        Matches the full path first. Files moved elsewhere (e.g. extracted from an
+        archive) are matched by name plus size, then by modification time. Names
+        only carry the day of month, so a name alone is never enough.
+        """
+        row = self.conn.execute(
+            "SELECT * FROM runs WHERE file_path = ?", (os.path.abspath(file_path),)
+        ).fetchone()
+        if row:
+            return dict(row)
+        
+        stat = os.stat(file_path)
+        rows = self.conn.execute(
+            "SELECT * FROM runs WHERE file_name = ? AND file_size = ?",
+            (os.path.basename(file_path), stat.st_size)
+        ).fetchall()
+        if len(rows) > 1:
+            mtime = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds')
+            rows = [row for row in rows if row['timestamp'] == mtime]
+        return dict(rows[0]) if len(rows) == 1 else None
+
+    def latest(self, **filters):
+        """Return the newest run for each (server, model_type, request_rate)
+        
+        Runs with the same timestamp are broken by insertion order, newest first.
+        """
+        clauses, params = self._where(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = ', '.join(('id',) + self.COLUMNS)
+        rows = self.conn.execute(f"""
+            SELECT {columns} FROM (
+                SELECT runs.*, ROW_NUMBER() OVER (
+                    PARTITION BY server, model_type, request_rate
+                    ORDER BY timestamp DESC, id DESC
+                ) AS position
+                FROM runs {where}
+            )
+            WHERE position = 1
+            ORDER BY server, model_type, request_rate
+        """, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _where(self, filters):
+        clauses, params = [], []
+        for key, value in filters.items():
+            if key not in self.FILTERS:
+                raise ValueError(f"Unsupported catalog filter: {key}")
+            if value is not None:
+                if key == 'file_path':
+                    value = os.path.abspath(value)
+                clauses.append(f"{key} = ?")
+                params.append(value)
+        return clauses, params
+
+    def index_directory(self, directory):
+        """Catalog legacy {server}_{day}_{rate}[_{model}].jsonl files, using mtime as timestamp"""
+        indexed = 0
+        for entry in os.scandir(directory):
+            if not entry.name.endswith('.jsonl'):
+                continue
+            parts = entry.name[:-len('.jsonl')].split('_')
+            if len(parts) < 3 or not parts[2].isdigit():
+                continue
+            model_type = parts[3] if len(parts) > 3 else 'default'
+            try:
+                self.record(parts[0], int(parts[2]), model_type, entry.path)
+                indexed += 1
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Could not catalog {entry.path}: {str(e)}")
+        return indexed
+
+    def close(self):
+        self.conn.close()
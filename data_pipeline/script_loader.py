@@ -0,0 +1,41 @@
+import importlib.util
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scripts live under hyphenated filenames, so they can't be imported by name
+SCRIPTS = {
+    'collection_pipeline': os.path.join('data_pipeline', 'collection_pipeline.py'),
+    'dashboard_updater': os.path.join('data_pipeline', 'dashboard-updater.py'),
+    'metrics_processor': os.path.join('config', 'metrics-processor.py'),
+    'rds_metrics_loader': os.path.join('config', 'rds-metrics-loader.py'),
+}
+
+# Dependencies that dominate startup time and must only be imported on demand
+HEAVY_MODULES = ('pandas', 'sqlalchemy', 'mysql.connector', 'py7zr', 'requests', 'schedule')
+
+_loaded = {}
+load_times = {}
+
+
+def load_script(name):
+    """Import one of the pipeline scripts by its short name, once per process"""
+    if name in _loaded:
+        return _loaded[name]
+
+    path = os.path.join(REPO_ROOT, SCRIPTS[name])
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f"llm_metrics_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    load_times[name] = time.perf_counter() - start
+
+    _loaded[name] = module
+    return module
+
+
+def loaded_heavy_modules():
+    """Return the heavy dependencies that have been imported so far"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
@@ -0,0 +1,84 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PIPELINE_DIR = os.path.join(REPO_ROOT, 'data_pipeline')
+CLI = os.path.join(PIPELINE_DIR, 'llm_metrics.py')
+sys.path.insert(0, PIPELINE_DIR)
+
+from script_loader import HEAVY_MODULES
+
+# Wall-clock budget for a full `python llm_metrics.py ...` process, interpreter included
+STARTUP_BUDGET = float(os.getenv('LLM_METRICS_STARTUP_BUDGET', '1.0'))
+
+# Runs a subcommand in a fresh interpreter and prints the heavy modules it imported
+RUNNER = """
+import json, sys
+sys.path.insert(0, {pipeline_dir!r})
+import llm_metrics, script_loader
+try:
+    llm_metrics.main({argv!r})
+except SystemExit:
+    pass
+print(json.dumps(script_loader.loaded_heavy_modules()))
+"""
+
+
+def heavy_imports(argv, cwd):
+    code = RUNNER.format(pipeline_dir=PIPELINE_DIR, argv=argv)
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def installed(*modules):
+    return all(importlib.util.find_spec(m.split('.')[0]) is not None for m in modules)
+
+
+@pytest.mark.parametrize('argv', [['--help'], ['status'], ['status', '--help']])
+def test_light_commands_import_no_heavy_modules(argv, tmp_path):
+    assert heavy_imports(argv, tmp_path) == set()
+
+
+def test_index_imports_no_heavy_modules(tmp_path):
+    (tmp_path / 'benchmark_files').mkdir()
+    (tmp_path / 'benchmark_files' / 'sglang_10_1.jsonl').write_text('{"dataset_name": "sharegpt"}\n')
+    assert heavy_imports(['index'], tmp_path) == set()
+
+
+def test_collect_imports_no_heavy_modules(tmp_path):
+    # benchmark-collector.py is absent, so the sweep fails fast after loading the pipeline
+    assert heavy_imports(['collect'], tmp_path) == set()
+
+
+@pytest.mark.skipif(not installed('pandas', 'py7zr'), reason='pandas and py7zr required')
+def test_process_imports_only_processing_modules(tmp_path):
+    imported = heavy_imports(['process', '--archive', 'missing.7z'], tmp_path)
+    assert imported & {'sqlalchemy', 'mysql.connector', 'requests', 'schedule'} == set()
+
+
+@pytest.mark.parametrize('argv', [['--help'], ['status']])
+def test_startup_within_budget(argv, tmp_path):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, CLI, *argv], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stderr
+    assert elapsed < STARTUP_BUDGET, f"{' '.join(argv)} took {elapsed:.2f}s"
+
+
+def test_importtime_reports_no_heavy_modules(tmp_path):
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI, 'status'], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+                if line.startswith('import time:')}
+    assert imported & set(HEAVY_MODULES) == set()
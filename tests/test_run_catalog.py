@@ -0,0 +1,99 @@
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'data_pipeline'))
+
+from run_catalog import RunCatalog
+from script_loader import load_script
+
+
+def write_run(path, mtime, dataset='sharegpt'):
+    path.write_text(f'{{"dataset_name": "{dataset}", "completed": 5}}\n')
+    os.utime(path, (mtime.timestamp(), mtime.timestamp()))
+    return path
+
+
+def test_open_existing_does_not_create_files(tmp_path):
+    db_path = tmp_path / 'missing' / 'run_catalog.sqlite'
+    assert RunCatalog.open_existing(str(db_path)) is None
+    assert not (tmp_path / 'missing').exists()
+
+
+def test_lookup_matches_full_path(tmp_path):
+    catalog = RunCatalog(str(tmp_path / 'run_catalog.sqlite'))
+    run = write_run(tmp_path / 'shortfin_10_4_none.jsonl', datetime(2026, 9, 10, 1, 2, 3))
+    catalog.record('shortfin', 4, 'none', str(run))
+
+    assert catalog.lookup(str(run))['timestamp'] == '2026-09-10T01:02:03'
+
+
+def test_lookup_does_not_mix_up_same_day_in_different_months(tmp_path):
+    catalog = RunCatalog(str(tmp_path / 'run_catalog.sqlite'))
+    for month in (8, 9):
+        month_dir = tmp_path / f'month_{month}'
+        month_dir.mkdir()
+        run = write_run(month_dir / 'shortfin_10_4_none.jsonl', datetime(2026, month, 10))
+        catalog.record('shortfin', 4, 'none', str(run))
+
+    # An extracted copy of the August file resolves to August, not the newest run
+    extracted = tmp_path / 'extracted'
+    extracted.mkdir()
+    copy = write_run(extracted / 'shortfin_10_4_none.jsonl', datetime(2026, 8, 10))
+    assert catalog.lookup(str(copy))['timestamp'] == '2026-08-10T00:00:00'
+
+    # A copy matching neither run is ambiguous, so callers fall back
+    other = write_run(extracted / 'shortfin_10_4_none.jsonl', datetime(2026, 7, 10))
+    assert catalog.lookup(str(other)) is None
+
+
+def test_find_by_file_path_and_size(tmp_path):
+    catalog = RunCatalog(':memory:')
+    run = write_run(tmp_path / 'sglang_10_1.jsonl', datetime(2026, 9, 10))
+    catalog.record('sglang', 1, None, str(run))
+
+    assert [r['file_name'] for r in catalog.find(file_path=str(run))] == ['sglang_10_1.jsonl']
+    assert len(catalog.find(file_size=run.stat().st_size)) == 1
+    plan = catalog.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE file_size = ?", (1,)
+    ).fetchall()
+    assert 'idx_runs_file_size' in plan[0][3]
+
+
+def test_latest_returns_one_run_per_cell_on_timestamp_ties(tmp_path):
+    catalog = RunCatalog(':memory:')
+    for name in ('sglang_10_1.jsonl', 'sglang_10_1_rerun.jsonl'):
+        run = write_run(tmp_path / name, datetime(2026, 9, 10, 1, 2, 3))
+        catalog.record('sglang', 1, None, str(run))
+
+    latest = catalog.latest()
+    assert [r['file_name'] for r in latest] == ['sglang_10_1_rerun.jsonl']
+
+
+def test_index_directory_skips_unreadable_files(tmp_path):
+    (tmp_path / 'sglang_10_1.jsonl').write_text('not json\n')
+    write_run(tmp_path / 'sglang_10_2.jsonl', datetime(2026, 9, 10))
+    catalog = RunCatalog(':memory:')
+
+    assert catalog.index_directory(str(tmp_path)) == 2
+    datasets = {run['request_rate']: run['dataset'] for run in catalog.find(server='sglang')}
+    assert datasets == {1: None, 2: 'sharegpt'}
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pandas') is None or importlib.util.find_spec('requests') is None,
+                    reason='pandas and requests required')
+def test_dashboard_falls_back_to_indexing_without_catalog(tmp_path):
+    write_run(tmp_path / 'shortfin_10_4_trie.jsonl', datetime(2026, 9, 10))
+    updater = load_script('dashboard_updater').GrafanaDashboardUpdater('key', 'http://grafana')
+    updater.process_jsonl_file = lambda filename: {}
+
+    metrics_data = updater.collect_metrics(str(tmp_path))
+
+    assert [(m['system'], m['cache_type'], m['concurrent_requests']) for m in metrics_data] == [
+        ('Shortfin', 'Trie', 4)
+    ]
+    assert not (tmp_path / 'run_catalog.sqlite').exists()
@@ -0,0 +1,148 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'data_pipeline'))
+
+from collection_pipeline import LLMMetricsPipeline
+
+
+class Frame:
+    """Stands in for a parsed DataFrame with no rows"""
+    empty = True
+
+
+class StubProcessor:
+    def __init__(self, polls, bad=()):
+        self.polls = polls
+        self.bad = set(bad)
+        self.parsed = []
+        self.catalog = StubCatalog()
+
+    def process_jsonl_file(self, path):
+        self.parsed.append((self.polls.count, path))
+        return None if path in self.bad else Frame()
+
+
+class StubCatalog:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StubLoader:
+    def __init__(self, fail=0):
+        self.fail = fail
+        self.loaded = []
+
+    def upsert_metrics(self, df):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError('database unavailable')
+        self.loaded.append(df)
+
+
+class ScriptedPolls:
+    """Returns one directory listing per poll, then signals stop once they run out"""
+
+    def __init__(self, states):
+        self.states = states
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self.states[min(self.count, len(self.states)) - 1]
+
+    def is_set(self):
+        return self.count >= len(self.states)
+
+    def wait(self, timeout):
+        pass
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return LLMMetricsPipeline('localhost', 'user', 'password', 'llm_metrics')
+
+
+def watch(pipeline, states, bad=(), seen=None, **kwargs):
+    polls = ScriptedPolls(states)
+    pipeline.benchmark_file_states = polls
+    processor = StubProcessor(polls, bad)
+    failed = pipeline.watch_benchmark_dir(polls, StubLoader(), processor, seen,
+                                          poll_interval=0, **kwargs)
+    return processor.parsed, failed
+
+
+def test_file_is_ingested_once_size_and_mtime_are_stable(pipeline):
+    states = [{'a.jsonl': (1, 10)}, {'a.jsonl': (2, 20)}, {'a.jsonl': (2, 20)}]
+    parsed, failed = watch(pipeline, states)
+
+    assert parsed == [(3, 'a.jsonl')]
+    assert failed == []
+
+
+def test_files_present_at_start_are_skipped(pipeline):
+    states = [{'old.jsonl': (1, 10), 'new.jsonl': (1, 5)}] * 2
+    parsed, _ = watch(pipeline, states, seen={'old.jsonl': (1, 10)})
+
+    assert [path for _, path in parsed] == ['new.jsonl']
+
+
+def test_remaining_files_are_flushed_on_stop(pipeline):
+    # Seen only once, so never stable before stop_event is set
+    parsed, failed = watch(pipeline, [{'a.jsonl': (1, 10), 'b.jsonl': (1, 10)}])
+
+    assert sorted(path for _, path in parsed) == ['a.jsonl', 'b.jsonl']
+    assert failed == []
+
+
+def test_failing_file_is_retried_then_returned_as_failed(pipeline):
+    states = [{'bad.jsonl': (1, 10), 'good.jsonl': (1, 10)}]
+    parsed, failed = watch(pipeline, states, bad={'bad.jsonl'}, max_attempts=3)
+
+    assert failed == ['bad.jsonl']
+    # The shared batch fails once, then each file is retried on its own
+    assert [path for _, path in parsed].count('good.jsonl') == 1
+    assert [path for _, path in parsed].count('bad.jsonl') == 4
+
+
+def test_watcher_error_makes_streaming_pipeline_raise(pipeline):
+    processor = StubProcessor(ScriptedPolls([{}]))
+    pipeline.prepare_streaming = lambda: (StubLoader(), processor)
+    pipeline.run_benchmark = lambda: True
+
+    def crash(*args, **kwargs):
+        raise RuntimeError('watcher crashed')
+    pipeline.watch_benchmark_dir = crash
+
+    with pytest.raises(Exception, match='Streaming watcher failed: watcher crashed'):
+        pipeline.run_streaming_pipeline(poll_interval=0)
+    assert processor.catalog.closed
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pandas') is None, reason='pandas required')
+def test_database_errors_are_retried_until_they_clear(pipeline):
+    import pandas as pd
+
+    class Processor(StubProcessor):
+        def process_jsonl_file(self, path):
+            return pd.DataFrame([{'server': 'sglang', 'output_tokens': 10, 'duration': 2.0}])
+
+        def add_derived_metrics(self, df):
+            df['tokens_per_second'] = df['output_tokens'] / df['duration']
+            return df
+
+    polls = ScriptedPolls([{'a.jsonl': (1, 10)}])
+    pipeline.benchmark_file_states = polls
+    loader = StubLoader(fail=2)
+    failed = pipeline.watch_benchmark_dir(polls, loader, Processor(polls), poll_interval=0,
+                                          max_attempts=5)
+
+    assert failed == []
+    assert list(loader.loaded[0]['tokens_per_second']) == [5.0]